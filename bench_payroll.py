@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Timing benchmark for the pay period close.
+Seeds a throwaway SQLite database with a two-week period of entries and
+times compute_pay_period in-process against the shared process pool, both
+on its first use (which pays for starting the processes) and once warm.
+These numbers back payroll.POOL_MIN_WORKERS.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import insert
+
+PERIOD_START = date(2024, 6, 1)
+PERIOD_END = date(2024, 6, 14)
+
+def seed(db, workers: int, entries_per_worker: int):
+    from models import Worker, TimeEntry
+    db.execute(insert(Worker), [{"id": i, "name": f"Worker {i}", "employee_id": f"EMP{i:06d}"} for i in range(1, workers + 1)])
+    batch = []
+    for worker_id in range(1, workers + 1):
+        for day in range(entries_per_worker):
+            start_time = datetime.combine(PERIOD_START + timedelta(days=day % 14), datetime.min.time()) + \
+                timedelta(hours=random.choice([6, 14, 20]))
+            hours = random.uniform(6, 12)
+            batch.append({
+                "worker_id": worker_id,
+                "project_id": 1,
+                "sub_department_id": 1,
+                "production_line_id": 1,
+                "start_time": start_time,
+                "end_time": start_time + timedelta(hours=hours),
+                "hours_worked": hours,
+                "description": "",
+                "created_at": start_time
+            })
+        if len(batch) >= 50000:
+            db.execute(insert(TimeEntry), batch)
+            batch = []
+    if batch:
+        db.execute(insert(TimeEntry), batch)
+    db.commit()
+
+def timed(compute):
+    started = time.perf_counter()
+    compute()
+    return time.perf_counter() - started
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the pay period close in-process and over the process pool.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[2000, 10000, 50000],
+                        help="Worker counts to time (default: 2000 10000 50000)")
+    parser.add_argument("--entries", type=int, default=14, help="Closed entries per worker (default: 14)")
+    parser.add_argument("--processes", type=int, default=4, help="Pool size (default: 4)")
+    args = parser.parse_args()
+    if args.processes < 2:
+        parser.error("--processes must be at least 2")
+
+    # database.py opens ./plant_time_tracker.db; spawned pool processes
+    # inherit the working directory, so every process sees the same file
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        import database
+        import payroll
+
+        print(f"{'workers':>8} {'in-process':>12} {'pool, first':>12} {'pool, warm':>12}")
+        for workers in args.workers:
+            database.Base.metadata.drop_all(bind=database.engine)
+            database.Base.metadata.create_all(bind=database.engine)
+            with database.SessionLocal() as db:
+                seed(db, workers, args.entries)
+
+            # Pool timings bypass the threshold by forcing partitions onto the pool
+            payroll.POOL_MIN_WORKERS = 0
+            with database.SessionLocal() as db:
+                in_process = timed(lambda: payroll.compute_pay_period(db, PERIOD_START, PERIOD_END, processes=1))
+                first = timed(lambda: payroll.compute_pay_period(db, PERIOD_START, PERIOD_END, processes=args.processes))
+                warm = timed(lambda: payroll.compute_pay_period(db, PERIOD_START, PERIOD_END, processes=args.processes))
+            print(f"{workers:>8,} {in_process:>11.2f}s {first:>11.2f}s {warm:>11.2f}s")
+
+            # Start the next worker count with a cold pool again
+            payroll._executor.shutdown()
+            payroll._executor = None
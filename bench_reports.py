@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for report result sets.
+Seeds an in-memory SQLite database and compares the memory per row of the
+previous reports path, ORM TimeEntry instances plus the nested per-row dicts
+the reports page used to build, against the report endpoint: a compact
+TimeEntryReport from reporting.py streamed to the client as JSON chunks.
+"""
+
+import argparse
+import gc
+import random
+import tracemalloc
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker, joinedload
+
+from models import Base, Department, SubDepartment, ProductionLine, Worker, Project, TimeEntry
+import reporting
+
+def seed(db, rows: int):
+    db.execute(insert(Department), [{"id": 1, "name": "Wall", "description": "Wall manufacturing department"}])
+    db.execute(insert(SubDepartment), [{"id": i, "name": f"Sub-department {i}", "department_id": 1} for i in range(1, 6)])
+    db.execute(insert(ProductionLine), [{"id": i, "name": f"Line {i}", "description": "Production line"} for i in range(1, 4)])
+    db.execute(insert(Worker), [{"id": i, "name": f"Worker {i}", "employee_id": f"EMP{i:05d}"} for i in range(1, 201)])
+    db.execute(insert(Project), [{"id": i, "name": f"Project {i}", "description": "Project"} for i in range(1, 21)])
+
+    descriptions = ["", "Framing", "Cutting studs", "Loading trucks", "Window install"]
+    start = datetime(2024, 1, 1, 6)
+    batch = []
+    for i in range(rows):
+        start_time = start + timedelta(minutes=i)
+        hours = random.uniform(4, 10)
+        batch.append({
+            "worker_id": random.randint(1, 200),
+            "project_id": random.randint(1, 20),
+            "sub_department_id": random.randint(1, 5),
+            "production_line_id": random.randint(1, 3),
+            "start_time": start_time,
+            "end_time": start_time + timedelta(hours=hours),
+            "hours_worked": hours,
+            "description": random.choice(descriptions),
+            "created_at": start_time
+        })
+        if len(batch) == 50000:
+            db.execute(insert(TimeEntry), batch)
+            batch = []
+    if batch:
+        db.execute(insert(TimeEntry), batch)
+    db.commit()
+
+def load_orm_with_dicts(db, rows: int):
+    """The previous reports path: ORM entries plus a nested dict per row"""
+    entries = db.query(TimeEntry).options(
+        joinedload(TimeEntry.worker), joinedload(TimeEntry.project), joinedload(TimeEntry.production_line),
+        joinedload(TimeEntry.sub_department).joinedload(SubDepartment.department)
+    ).limit(rows).all()
+    data = []
+    for entry in entries:
+        data.append({
+            "id": entry.id,
+            "worker_id": entry.worker_id,
+            "project_id": entry.project_id,
+            "sub_department_id": entry.sub_department_id,
+            "production_line_id": entry.production_line_id,
+            "start_time": entry.start_time.isoformat() if entry.start_time else None,
+            "end_time": entry.end_time.isoformat() if entry.end_time else None,
+            "hours_worked": entry.hours_worked,
+            "description": entry.description,
+            "created_at": entry.created_at.isoformat() if entry.created_at else None,
+            "worker": {"id": entry.worker.id, "name": entry.worker.name, "employee_id": entry.worker.employee_id},
+            "project": {"id": entry.project.id, "name": entry.project.name, "description": entry.project.description},
+            "sub_department": {
+                "id": entry.sub_department.id,
+                "name": entry.sub_department.name,
+                "department_id": entry.sub_department.department_id,
+                "department": {
+                    "id": entry.sub_department.department.id,
+                    "name": entry.sub_department.department.name,
+                    "description": entry.sub_department.department.description
+                }
+            },
+            "production_line": {
+                "id": entry.production_line.id,
+                "name": entry.production_line.name,
+                "description": entry.production_line.description
+            }
+        })
+    return entries, data
+
+def measure(label: str, rows: int, load):
+    gc.collect()
+    tracemalloc.start()
+    result = load()
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} {rows:>10,} rows  {retained / rows:>8.0f} B/row retained  {peak / rows:>8.0f} B/row peak")
+    del result
+    return retained / rows, peak / rows
+
+def stream_report(db, rows: int):
+    """The report endpoint path: build the compact report and send its JSON chunks as bytes"""
+    report = reporting.get_time_entry_report(db, limit=rows)
+    sent = 0
+    for chunk in report.iter_json():
+        sent += len(chunk.encode("utf-8"))
+    return report, sent
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare memory per row of report result sets.")
+    parser.add_argument("--rows", type=int, default=1000000, help="Rows loaded on each side (default: 1,000,000)")
+    parser.add_argument("--baseline-rows", type=int, default=None,
+                        help="Rows loaded through the ORM baseline if it should differ, it needs about 3 GB "
+                             "at 1M rows (default: same as --rows)")
+    args = parser.parse_args()
+    baseline_rows = args.baseline_rows or args.rows
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+
+    print(f"Seeding {max(args.rows, baseline_rows):,} time entries...")
+    with Session() as db:
+        seed(db, max(args.rows, baseline_rows))
+
+    with Session() as db:
+        baseline, _ = measure("ORM entries + nested dicts", baseline_rows,
+                              lambda: load_orm_with_dicts(db, baseline_rows))
+    with Session() as db:
+        retained, peak = measure("Report endpoint (streamed)", args.rows, lambda: stream_report(db, args.rows))
+
+    print(f"The report endpoint retains {baseline / retained:.1f}x less memory per row, "
+          f"and peaks at {baseline / peak:.1f}x less than the ORM path retains")
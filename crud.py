@@ -1,10 +1,11 @@
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
-from models import Department, SubDepartment, ProductionLine, Worker, Project, TimeEntry
+from models import Department, SubDepartment, ProductionLine, Worker, Project, TimeEntry, PayPeriodTotal
 from schemas import (
     DepartmentCreate, SubDepartmentCreate, ProductionLineCreate, 
     WorkerCreate, ProjectCreate, TimeEntryCreate, TimeEntryUpdate
 )
-from datetime import datetime
+from datetime import date, datetime
 from typing import List, Optional
 
 # Department CRUD
@@ -137,3 +138,20 @@ def get_active_time_entries(db: Session, worker_id: Optional[int] = None):
         query = query.filter(TimeEntry.worker_id == worker_id)
     return query.all()
 
+# PayPeriodTotal CRUD
+def get_pay_period_totals(db: Session, period_start: date, period_end: date, worker_id: Optional[int] = None):
+    query = db.query(PayPeriodTotal).filter(
+        PayPeriodTotal.period_start == period_start,
+        PayPeriodTotal.period_end == period_end
+    )
+    if worker_id:
+        query = query.filter(PayPeriodTotal.worker_id == worker_id)
+    return query.order_by(PayPeriodTotal.worker_id).all()
+
+def get_overlapping_pay_period(db: Session, period_start: date, period_end: date):
+    """Get the bounds of a closed pay period, other than this exact one, that shares a day with it"""
+    return db.query(PayPeriodTotal.period_start, PayPeriodTotal.period_end).filter(
+        PayPeriodTotal.period_start <= period_end,
+        PayPeriodTotal.period_end >= period_start,
+        or_(PayPeriodTotal.period_start != period_start, PayPeriodTotal.period_end != period_end)
+    ).first()
@@ -8,9 +8,20 @@ DATABASE_URL = "sqlite:///./plant_time_tracker.db"
 engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Rows fetched per batch when streaming large queries
+STREAM_BATCH_SIZE = 1000
+# Keep IN (...) lists well below SQLite's bound parameter limit
+MAX_IN_LIST_SIZE = 500
+
 # Create tables
 Base.metadata.create_all(bind=engine)
 
+# create_all only builds indexes for tables it creates, so indexes added to
+# an existing table (e.g. ix_time_entries_worker_start) are created here
+for table in Base.metadata.sorted_tables:
+    for index in table.indexes:
+        index.create(bind=engine, checkfirst=True)
+
 def get_db():
     db = SessionLocal()
     try:
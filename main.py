@@ -1,13 +1,16 @@
 from fastapi import FastAPI, Depends, HTTPException, Request, Form
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from markupsafe import Markup
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from datetime import datetime
+from datetime import date, datetime
 
 from database import get_db
 import crud
+import payroll
+import reporting
 import schemas
 from models import TimeEntry, Worker, Project, SubDepartment, ProductionLine
 
@@ -139,6 +142,28 @@ def clock_out(time_entry_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Time entry not found")
     return time_entry
 
+# Pay period endpoints
+@app.post("/api/pay-periods/close", response_model=List[schemas.PayPeriodTotal])
+def close_pay_period(pay_period: schemas.PayPeriodClose, db: Session = Depends(get_db)):
+    if pay_period.period_end < pay_period.period_start:
+        raise HTTPException(status_code=400, detail="period_end must not be before period_start")
+    # Re-closing the same period replaces its totals; a different overlapping period would count shifts twice
+    overlapping = crud.get_overlapping_pay_period(db, period_start=pay_period.period_start, period_end=pay_period.period_end)
+    if overlapping:
+        raise HTTPException(status_code=400, detail=f"Pay period overlaps closed period {overlapping.period_start} - {overlapping.period_end}")
+    return payroll.close_pay_period(db, period_start=pay_period.period_start, period_end=pay_period.period_end)
+
+@app.get("/api/pay-periods/totals", response_model=List[schemas.PayPeriodTotal])
+def read_pay_period_totals(period_start: date, period_end: date, worker_id: Optional[int] = None, db: Session = Depends(get_db)):
+    return crud.get_pay_period_totals(db, period_start=period_start, period_end=period_end, worker_id=worker_id)
+
+# Report endpoints
+# Streamed straight from the report's column arrays; the schema only documents the response
+@app.get("/api/reports/time-entries", responses={200: {"model": schemas.TimeEntryReport}})
+def read_time_entry_report(skip: int = 0, limit: int = 1000, worker_id: Optional[int] = None, db: Session = Depends(get_db)):
+    report = reporting.get_time_entry_report(db, skip=skip, limit=limit, worker_id=worker_id)
+    return StreamingResponse(report.iter_json(), media_type="application/json")
+
 # Web UI Routes
 @app.get("/", response_class=HTMLResponse)
 async def dashboard(request: Request, db: Session = Depends(get_db)):
@@ -176,56 +201,14 @@ async def setup(request: Request, db: Session = Depends(get_db)):
 
 @app.get("/reports", response_class=HTMLResponse)
 async def reports(request: Request, db: Session = Depends(get_db)):
-    time_entries = crud.get_time_entries(db, limit=50)
+    time_entries = reporting.get_time_entry_report(db, limit=50)
     workers = crud.get_workers(db)
     projects = crud.get_projects(db)
     
-    # Convert time entries to serializable format
-    time_entries_data = []
-    for entry in time_entries:
-        entry_dict = {
-            "id": entry.id,
-            "worker_id": entry.worker_id,
-            "project_id": entry.project_id,
-            "sub_department_id": entry.sub_department_id,
-            "production_line_id": entry.production_line_id,
-            "start_time": entry.start_time.isoformat() if entry.start_time else None,
-            "end_time": entry.end_time.isoformat() if entry.end_time else None,
-            "hours_worked": entry.hours_worked,
-            "description": entry.description,
-            "created_at": entry.created_at.isoformat() if entry.created_at else None,
-            "worker": {
-                "id": entry.worker.id,
-                "name": entry.worker.name,
-                "employee_id": entry.worker.employee_id
-            },
-            "project": {
-                "id": entry.project.id,
-                "name": entry.project.name,
-                "description": entry.project.description
-            },
-            "sub_department": {
-                "id": entry.sub_department.id,
-                "name": entry.sub_department.name,
-                "department_id": entry.sub_department.department_id,
-                "department": {
-                    "id": entry.sub_department.department.id,
-                    "name": entry.sub_department.department.name,
-                    "description": entry.sub_department.department.description
-                }
-            },
-            "production_line": {
-                "id": entry.production_line.id,
-                "name": entry.production_line.name,
-                "description": entry.production_line.description
-            }
-        }
-        time_entries_data.append(entry_dict)
-    
     return templates.TemplateResponse("reports.html", {
         "request": request,
-        "time_entries": time_entries,  # Keep original for template rendering
-        "time_entries_data": time_entries_data,  # Serializable data for JavaScript
+        "time_entries": time_entries,  # Compact rows for template rendering
+        "time_entries_json": Markup("".join(time_entries.iter_json())),  # Serialized data for JavaScript
         "workers": workers,
         "projects": projects
     })
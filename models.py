@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Float, Index, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -54,6 +54,9 @@ class Project(Base):
 
 class TimeEntry(Base):
     __tablename__ = "time_entries"
+    __table_args__ = (
+        Index("ix_time_entries_worker_start", "worker_id", "start_time"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     worker_id = Column(Integer, ForeignKey("workers.id"))
@@ -71,3 +74,20 @@ class TimeEntry(Base):
     sub_department = relationship("SubDepartment", back_populates="time_entries")
     production_line = relationship("ProductionLine", back_populates="time_entries")
 
+class PayPeriodTotal(Base):
+    __tablename__ = "pay_period_totals"
+    __table_args__ = (
+        UniqueConstraint("worker_id", "period_start", "period_end", name="uq_pay_period_totals_worker_period"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    worker_id = Column(Integer, ForeignKey("workers.id"), index=True)
+    period_start = Column(Date, index=True)
+    period_end = Column(Date, index=True)
+    regular_hours = Column(Float, default=0.0)
+    overtime_hours = Column(Float, default=0.0)
+    night_hours = Column(Float, default=0.0)
+    total_hours = Column(Float, default=0.0)
+    computed_at = Column(DateTime, default=datetime.utcnow)
+    
+    worker = relationship("Worker")
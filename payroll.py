@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Pay period close for the Plant Time Tracker.
+Computes per-worker regular, overtime and night-shift hours from closed
+time entries and stores them in the pay_period_totals table. Workers are
+partitioned and each partition streams its entries straight from the
+database in start_time order. Large closes fan the partitions out over a
+process pool that is started once and reused.
+"""
+
+import argparse
+import math
+import multiprocessing
+import os
+import threading
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, datetime, time, timedelta
+from itertools import groupby
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+import crud
+from database import MAX_IN_LIST_SIZE, STREAM_BATCH_SIZE, SessionLocal
+from models import PayPeriodTotal, TimeEntry, Worker
+
+# Overtime rules
+DAILY_OVERTIME_THRESHOLD = 8.0
+WEEKLY_OVERTIME_THRESHOLD = 40.0
+
+# Night shift window, wrapping midnight (22:00 - 06:00)
+NIGHT_SHIFT_START = time(22, 0)
+NIGHT_SHIFT_END = time(6, 0)
+
+# Each partition is one IN (...) list; keep partitions big enough that
+# small closes run in-process without a pool
+MIN_PARTITION_SIZE = 250
+MAX_PARTITION_SIZE = MAX_IN_LIST_SIZE
+# Used when no process count is given, e.g. by the close endpoint
+DEFAULT_PROCESSES = min(4, os.cpu_count() or 1)
+# Closes with fewer workers run in-process. At about 0.16 ms per worker
+# (14 entries each) they finish in under 1.6s, less than the 2 - 3s it
+# takes to start the spawn pool.
+POOL_MIN_WORKERS = 10000
+
+def _overlap_hours(start: datetime, end: datetime, window_start: datetime, window_end: datetime) -> float:
+    seconds = (min(end, window_end) - max(start, window_start)).total_seconds()
+    return seconds / 3600 if seconds > 0 else 0.0
+
+def _night_hours(start: datetime, end: datetime) -> float:
+    """Hours of [start, end) inside the night window. Both must fall on the same calendar day."""
+    day = datetime.combine(start.date(), time.min)
+    morning_end = datetime.combine(start.date(), NIGHT_SHIFT_END)
+    evening_start = datetime.combine(start.date(), NIGHT_SHIFT_START)
+    return (_overlap_hours(start, end, day, morning_end) +
+            _overlap_hours(start, end, evening_start, day + timedelta(days=1)))
+
+def compute_worker_totals(entries: Iterable[Tuple[datetime, datetime]], period_start: date):
+    """
+    Compute (regular, overtime, night, total) hours for one worker.
+    Entries are (start_time, end_time) pairs for shifts that start within
+    the period. Each shift counts in full toward the workday it started on,
+    so a shift that runs past midnight or past the period end is one workday
+    in this period. Daily overtime is applied first, then weekly overtime on the
+    remaining regular hours, with weeks counted from period_start. Night
+    hours are the part of the total worked inside the night shift window.
+    """
+    daily_hours = defaultdict(float)
+    night = 0.0
+    for start_time, end_time in entries:
+        workday = start_time.date()
+        start, end = start_time, end_time
+        # Split at midnight only to find the night hours of each calendar day
+        while start < end:
+            next_midnight = datetime.combine(start.date() + timedelta(days=1), time.min)
+            piece_end = min(end, next_midnight)
+            daily_hours[workday] += (piece_end - start).total_seconds() / 3600
+            night += _night_hours(start, piece_end)
+            start = piece_end
+
+    overtime = 0.0
+    weekly_regular = defaultdict(float)
+    for day, hours in daily_hours.items():
+        daily_overtime = max(0.0, hours - DAILY_OVERTIME_THRESHOLD)
+        overtime += daily_overtime
+        weekly_regular[(day - period_start).days // 7] += hours - daily_overtime
+
+    regular = 0.0
+    for hours in weekly_regular.values():
+        regular += min(hours, WEEKLY_OVERTIME_THRESHOLD)
+        overtime += max(0.0, hours - WEEKLY_OVERTIME_THRESHOLD)
+
+    return regular, overtime, night, regular + overtime
+
+def _compute_partition(worker_ids: List[int], period_start: date, period_end: date,
+                       db: Optional[Session] = None) -> List[dict]:
+    """
+    Stream closed entries for a set of workers and compute their totals.
+    Runs on db when given; pool processes pass none and open their own session.
+    """
+    range_start = datetime.combine(period_start, time.min)
+    range_end = datetime.combine(period_end + timedelta(days=1), time.min)
+
+    query = (
+        select(TimeEntry.worker_id, TimeEntry.start_time, TimeEntry.end_time)
+        .where(
+            TimeEntry.worker_id.in_(worker_ids),
+            TimeEntry.end_time.is_not(None),
+            TimeEntry.start_time >= range_start,
+            TimeEntry.start_time < range_end,
+        )
+        .order_by(TimeEntry.worker_id, TimeEntry.start_time)
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+
+    totals = {}
+    session = db if db is not None else SessionLocal()
+    try:
+        result = session.execute(query)
+        for worker_id, worker_entries in groupby(result, key=lambda row: row.worker_id):
+            totals[worker_id] = compute_worker_totals(
+                ((row.start_time, row.end_time) for row in worker_entries), period_start
+            )
+    finally:
+        if db is None:
+            session.close()
+
+    # Every worker gets a row, so "worked 0 hours" is distinguishable from "not closed"
+    rows = []
+    for worker_id in worker_ids:
+        regular, overtime, night, _ = totals.get(worker_id, (0.0, 0.0, 0.0, 0.0))
+        regular_hours = round(regular, 2)
+        overtime_hours = round(overtime, 2)
+        rows.append({
+            "worker_id": worker_id,
+            "regular_hours": regular_hours,
+            "overtime_hours": overtime_hours,
+            "night_hours": round(night, 2),
+            "total_hours": round(regular_hours + overtime_hours, 2),
+        })
+    return rows
+
+def _partition(worker_ids: List[int], processes: int) -> List[List[int]]:
+    if not worker_ids:
+        return []
+    size = min(MAX_PARTITION_SIZE, max(MIN_PARTITION_SIZE, math.ceil(len(worker_ids) / (processes * 4))))
+    return [worker_ids[i:i + size] for i in range(0, len(worker_ids), size)]
+
+_executor = None
+_executor_processes = None
+_executor_lock = threading.Lock()
+
+def _get_executor(processes: int) -> ProcessPoolExecutor:
+    """
+    Return the shared process pool, starting it on first use, when the
+    process count changes, or when a child died and broke the pool
+    """
+    global _executor, _executor_processes
+    with _executor_lock:
+        if _executor is None or _executor_processes != processes or _executor._broken:
+            if _executor is not None:
+                _executor.shutdown(wait=not _executor._broken)
+            # spawn keeps children from inheriting the parent's pooled connections and threads
+            context = multiprocessing.get_context("spawn")
+            _executor = ProcessPoolExecutor(max_workers=processes, mp_context=context)
+            _executor_processes = processes
+        return _executor
+
+def _discard_executor(executor: ProcessPoolExecutor):
+    """Drop a broken pool so the next close starts a new one"""
+    global _executor, _executor_processes
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+            _executor_processes = None
+    executor.shutdown(wait=False)
+
+def compute_pay_period(db: Session, period_start: date, period_end: date, processes: Optional[int] = None) -> List[dict]:
+    """Compute totals for every worker, fanning partitions out over a process pool on large closes"""
+    if processes is None:
+        processes = DEFAULT_PROCESSES
+    worker_ids = list(db.scalars(select(Worker.id).order_by(Worker.id)))
+    partitions = _partition(worker_ids, processes)
+
+    if processes == 1 or len(partitions) <= 1 or len(worker_ids) < POOL_MIN_WORKERS:
+        results = [_compute_partition(ids, period_start, period_end, db) for ids in partitions]
+    else:
+        executor = _get_executor(processes)
+        try:
+            results = list(executor.map(
+                _compute_partition, partitions,
+                [period_start] * len(partitions), [period_end] * len(partitions)
+            ))
+        except BrokenProcessPool:
+            # A pool process died mid-close; finish in-process rather than fail the close
+            _discard_executor(executor)
+            results = [_compute_partition(ids, period_start, period_end, db) for ids in partitions]
+
+    return [row for partition_rows in results for row in partition_rows]
+
+def close_pay_period(db: Session, period_start: date, period_end: date, processes: Optional[int] = None):
+    """
+    Compute and store pay period totals. Existing totals for the same period
+    are replaced in the same transaction, so re-running a close is idempotent.
+    Callers reject periods that overlap a different closed period first.
+    """
+    rows = compute_pay_period(db, period_start, period_end, processes=processes)
+    computed_at = datetime.utcnow()
+    for row in rows:
+        row.update(period_start=period_start, period_end=period_end, computed_at=computed_at)
+
+    try:
+        db.execute(delete(PayPeriodTotal).where(
+            PayPeriodTotal.period_start == period_start,
+            PayPeriodTotal.period_end == period_end
+        ))
+        if rows:
+            db.execute(insert(PayPeriodTotal), rows)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return db.query(PayPeriodTotal).filter(
+        PayPeriodTotal.period_start == period_start,
+        PayPeriodTotal.period_end == period_end
+    ).order_by(PayPeriodTotal.worker_id).all()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Close a pay period and store per-worker totals.")
+    parser.add_argument("period_start", type=date.fromisoformat, help="First day of the period (YYYY-MM-DD)")
+    parser.add_argument("period_end", type=date.fromisoformat, help="Last day of the period, inclusive (YYYY-MM-DD)")
+    parser.add_argument("--processes", type=int, default=None, help=f"Number of worker processes (default: {DEFAULT_PROCESSES})")
+    args = parser.parse_args()
+
+    if args.processes is not None and args.processes < 1:
+        parser.error("--processes must be at least 1")
+    if args.period_end < args.period_start:
+        parser.error("period_end must not be before period_start")
+
+    db = SessionLocal()
+    try:
+        overlapping = crud.get_overlapping_pay_period(db, args.period_start, args.period_end)
+        if overlapping:
+            parser.error(f"pay period overlaps closed period {overlapping.period_start} - {overlapping.period_end}")
+        totals = close_pay_period(db, args.period_start, args.period_end, processes=args.processes)
+        print(f"✅ Closed pay period {args.period_start} - {args.period_end} for {len(totals)} workers")
+    finally:
+        db.close()
@@ -0,0 +1,236 @@
+"""
+Compact read-only result types for reports and exports.
+Bulk reads select plain columns instead of loading TimeEntry instances, so
+nothing is tracked by the session identity map. Entries are kept in
+array-backed columns; workers, projects, departments, sub-departments and
+production lines are loaded once per distinct id into shared lookup tables.
+"""
+
+import json
+import math
+from array import array
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from database import MAX_IN_LIST_SIZE, STREAM_BATCH_SIZE
+from models import Department, SubDepartment, ProductionLine, Worker, Project, TimeEntry
+
+# Timestamps are stored as microseconds since the (naive) epoch
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_NO_TIME = -2 ** 63
+
+def _to_micros(value: Optional[datetime]) -> int:
+    return _NO_TIME if value is None else (value - _EPOCH) // _MICROSECOND
+
+def _from_micros(value: int) -> Optional[datetime]:
+    return None if value == _NO_TIME else _EPOCH + timedelta(microseconds=value)
+
+def _isoformat(value: Optional[datetime]):
+    return value.isoformat() if value else None
+
+def _micros_isoformat(value: int):
+    return _isoformat(_from_micros(value))
+
+def _hours(value: float):
+    return None if math.isnan(value) else value
+
+def _dumps(value) -> str:
+    """JSON text that is also safe inside a <script> tag, escaped the way Jinja's tojson does"""
+    return (json.dumps(value).replace("<", "\\u003c").replace(">", "\\u003e")
+            .replace("&", "\\u0026").replace("'", "\\u0027"))
+
+class _ReadOnly:
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+class _Ref(_ReadOnly):
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            object.__setattr__(self, name, value)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+class WorkerRef(_Ref):
+    __slots__ = ("id", "name", "employee_id")
+
+class ProjectRef(_Ref):
+    __slots__ = ("id", "name", "description", "created_at")
+
+    def to_dict(self):
+        return {"id": self.id, "name": self.name, "description": self.description,
+                "created_at": _isoformat(self.created_at)}
+
+class DepartmentRef(_Ref):
+    __slots__ = ("id", "name", "description")
+
+class SubDepartmentRef(_Ref):
+    __slots__ = ("id", "name", "department_id", "department")
+
+    def to_dict(self):
+        return {"id": self.id, "name": self.name, "department_id": self.department_id}
+
+class ProductionLineRef(_Ref):
+    __slots__ = ("id", "name", "description")
+
+class ReportRow(_ReadOnly):
+    """A read-only view of one report entry. Related objects are None when their row is missing."""
+    __slots__ = (
+        "id", "worker_id", "project_id", "sub_department_id", "production_line_id",
+        "start_time", "end_time", "hours_worked", "description", "created_at",
+        "worker", "project", "sub_department", "production_line"
+    )
+
+    def __init__(self, **values):
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+class TimeEntryReport:
+    """Report entries stored column by column, plus the lookup tables they reference"""
+
+    def __init__(self):
+        self.workers: Dict[int, WorkerRef] = {}
+        self.projects: Dict[int, ProjectRef] = {}
+        self.departments: Dict[int, DepartmentRef] = {}
+        self.sub_departments: Dict[int, SubDepartmentRef] = {}
+        self.production_lines: Dict[int, ProductionLineRef] = {}
+
+        self.ids = array("q")
+        # Foreign key columns hold interned ints (or None) shared with the lookup tables
+        self.worker_ids = []
+        self.project_ids = []
+        self.sub_department_ids = []
+        self.production_line_ids = []
+        self.start_times = array("q")
+        self.end_times = array("q")
+        self.created_ats = array("q")
+        self.hours_worked = array("d")
+        self.descriptions = []
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        for index in range(len(self.ids)):
+            yield self.row(index)
+
+    def row(self, index: int) -> ReportRow:
+        return ReportRow(
+            id=self.ids[index],
+            worker_id=self.worker_ids[index],
+            project_id=self.project_ids[index],
+            sub_department_id=self.sub_department_ids[index],
+            production_line_id=self.production_line_ids[index],
+            start_time=_from_micros(self.start_times[index]),
+            end_time=_from_micros(self.end_times[index]),
+            hours_worked=_hours(self.hours_worked[index]),
+            description=self.descriptions[index],
+            created_at=_from_micros(self.created_ats[index]),
+            worker=self.workers.get(self.worker_ids[index]),
+            project=self.projects.get(self.project_ids[index]),
+            sub_department=self.sub_departments.get(self.sub_department_ids[index]),
+            production_line=self.production_lines.get(self.production_line_ids[index])
+        )
+
+    def iter_json(self) -> Iterator[str]:
+        """
+        Serialize for JavaScript in chunks, straight from the column arrays.
+        Related objects are sent once in lookup tables keyed by id, and entries
+        are sent as column arrays. The text is safe to embed in a <script> tag.
+        """
+        for name in ("workers", "projects", "departments", "sub_departments", "production_lines"):
+            refs = getattr(self, name)
+            yield ("{" if name == "workers" else ",") + f'"{name}":' + \
+                _dumps({key: ref.to_dict() for key, ref in refs.items()})
+
+        columns = (
+            ("id", self.ids, None),
+            ("worker_id", self.worker_ids, None),
+            ("project_id", self.project_ids, None),
+            ("sub_department_id", self.sub_department_ids, None),
+            ("production_line_id", self.production_line_ids, None),
+            ("start_time", self.start_times, _micros_isoformat),
+            ("end_time", self.end_times, _micros_isoformat),
+            ("hours_worked", self.hours_worked, _hours),
+            ("description", self.descriptions, None),
+            ("created_at", self.created_ats, _micros_isoformat)
+        )
+        yield ',"entries":{'
+        for position, (name, values, convert) in enumerate(columns):
+            yield ("," if position else "") + f'"{name}":['
+            for start in range(0, len(values), STREAM_BATCH_SIZE):
+                batch = values[start:start + STREAM_BATCH_SIZE]
+                batch = [convert(value) for value in batch] if convert else list(batch)
+                yield ("," if start else "") + _dumps(batch)[1:-1]
+            yield "]"
+        yield "}}"
+
+def _select_by_ids(db: Session, columns, ids):
+    """Rows whose first column is in ids, queried in chunks"""
+    ids = sorted(key for key in ids if key is not None)
+    for start in range(0, len(ids), MAX_IN_LIST_SIZE):
+        yield from db.execute(select(*columns).where(columns[0].in_(ids[start:start + MAX_IN_LIST_SIZE])))
+
+def _load_refs(db: Session, ref_class, columns, ids):
+    return {values[0]: ref_class(*values) for values in _select_by_ids(db, columns, ids)}
+
+def get_time_entry_report(db: Session, skip: int = 0, limit: Optional[int] = 100, worker_id: Optional[int] = None):
+    """Load time entries for reporting as a compact TimeEntryReport"""
+    entries = select(
+        TimeEntry.id, TimeEntry.worker_id, TimeEntry.project_id, TimeEntry.sub_department_id,
+        TimeEntry.production_line_id, TimeEntry.start_time, TimeEntry.end_time,
+        TimeEntry.hours_worked, TimeEntry.description, TimeEntry.created_at
+    ).order_by(TimeEntry.id)
+    if worker_id:
+        entries = entries.where(TimeEntry.worker_id == worker_id)
+    entries = entries.offset(skip).limit(limit)
+
+    report = TimeEntryReport()
+    # One shared object per distinct id and description
+    interned_ids = {}
+    descriptions = {}
+    for (entry_id, entry_worker_id, project_id, sub_department_id, production_line_id,
+         start_time, end_time, hours_worked, description, created_at) in db.execute(
+            entries.execution_options(yield_per=STREAM_BATCH_SIZE)):
+        report.ids.append(entry_id)
+        report.worker_ids.append(interned_ids.setdefault(entry_worker_id, entry_worker_id))
+        report.project_ids.append(interned_ids.setdefault(project_id, project_id))
+        report.sub_department_ids.append(interned_ids.setdefault(sub_department_id, sub_department_id))
+        report.production_line_ids.append(interned_ids.setdefault(production_line_id, production_line_id))
+        report.start_times.append(_to_micros(start_time))
+        report.end_times.append(_to_micros(end_time))
+        report.created_ats.append(_to_micros(created_at))
+        report.hours_worked.append(math.nan if hours_worked is None else hours_worked)
+        report.descriptions.append(descriptions.setdefault(description, description))
+
+    # Resolve each distinct related id once, from the ids seen while streaming
+    report.workers = _load_refs(db, WorkerRef, (Worker.id, Worker.name, Worker.employee_id),
+                                set(report.worker_ids))
+    report.projects = _load_refs(db, ProjectRef, (Project.id, Project.name, Project.description, Project.created_at),
+                                 set(report.project_ids))
+    report.production_lines = _load_refs(db, ProductionLineRef,
+                                         (ProductionLine.id, ProductionLine.name, ProductionLine.description),
+                                         set(report.production_line_ids))
+    sub_department_rows = list(_select_by_ids(
+        db, (SubDepartment.id, SubDepartment.name, SubDepartment.department_id), set(report.sub_department_ids)
+    ))
+    report.departments = _load_refs(db, DepartmentRef, (Department.id, Department.name, Department.description),
+                                    {department_id for _, _, department_id in sub_department_rows})
+    report.sub_departments = {
+        sub_department_id: SubDepartmentRef(sub_department_id, name, department_id,
+                                            report.departments.get(department_id))
+        for sub_department_id, name, department_id in sub_department_rows
+    }
+
+    return report
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
-from datetime import datetime
-from typing import Optional, List
+from datetime import date, datetime
+from typing import Dict, Optional, List
 
 # Department Schemas
 class DepartmentBase(BaseModel):
@@ -99,6 +99,46 @@ class TimeEntry(TimeEntryBase):
     class Config:
         from_attributes = True
 
+# PayPeriod Schemas
+class PayPeriodClose(BaseModel):
+    period_start: date
+    period_end: date
+
+class PayPeriodTotal(BaseModel):
+    id: int
+    worker_id: int
+    period_start: date
+    period_end: date
+    regular_hours: float
+    overtime_hours: float
+    night_hours: float
+    total_hours: float
+    computed_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+# Report Schemas
+class TimeEntryReportColumns(BaseModel):
+    id: List[int]
+    worker_id: List[Optional[int]]
+    project_id: List[Optional[int]]
+    sub_department_id: List[Optional[int]]
+    production_line_id: List[Optional[int]]
+    start_time: List[Optional[datetime]]
+    end_time: List[Optional[datetime]]
+    hours_worked: List[Optional[float]]
+    description: List[Optional[str]]
+    created_at: List[Optional[datetime]]
+
+class TimeEntryReport(BaseModel):
+    workers: Dict[int, Worker]
+    projects: Dict[int, Project]
+    departments: Dict[int, Department]
+    sub_departments: Dict[int, SubDepartment]
+    production_lines: Dict[int, ProductionLine]
+    entries: TimeEntryReportColumns
+
 # Response schemas with relationships
 class DepartmentWithSubs(Department):
     sub_departments: List[SubDepartment] = []